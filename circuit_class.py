@@ -1,3 +1,11 @@
+import os
+import sys
+from collections import deque
+
+# Critical path results keyed by circuit file, modification time and component delays
+_analysis_cache = {}
+
+
 class Circuit:
     def __init__(self, file_path):
         """
@@ -7,9 +15,20 @@ class Circuit:
             file_path (str): Path to the text file containing the circuit description.
         """
         self.file_path = file_path
+        self.file_mtime = None
         self.nodes = {}
         self.inputs = []
         self.outputs = []
+        # Flat per-node arrays indexed by node position, built from self.nodes
+        self.node_ids = []
+        self.node_index = {}
+        self.type_names = []
+        self.type_ids = []
+        self.inputs_indptr = [0]
+        self.inputs_indices = []
+        self.outputs_indptr = [0]
+        self.outputs_indices = []
+        self.output_indices = []
         self.component_delays = {
             "ADD": 1.0,
             "MUL": 1.0,
@@ -26,35 +45,39 @@ class Circuit:
         node_counter = 0
 
         try:
-            with open(self.file_path, "r") as file:
-                for line in file:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-
-                    parts = line.split()
-                    if len(parts) < 2:
-                        raise ValueError(f"Invalid line format: {line}")
-
-                    node_type, node_id = parts[0], parts[1]
-                    inputs = parts[2:] if len(parts) > 2 else []
-
-                    # Assign a unique ID to the node
-                    unique_id = f"node_{node_counter}"
-                    node_counter += 1
-
-                    # Store the node details
-                    self.nodes[node_id] = {
-                        "unique_id": unique_id,
-                        "type": node_type,
-                        "inputs": inputs,
-                        "outputs": [],
-                    }
-
-                    if node_type == "INPUT":
-                        self.inputs.append(node_id)
-                    elif node_type == "OUTPUT":
-                        self.outputs.append(node_id)
+            self.file_mtime = os.stat(self.file_path).st_mtime_ns
+            # Read the whole file at once and split it in memory
+            with open(self.file_path, "r", buffering=1 << 20) as file:
+                data = file.read()
+
+            for line in data.splitlines():
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                parts = line.split()
+                if len(parts) < 2:
+                    raise ValueError(f"Invalid line format: {line}")
+
+                node_type, node_id = sys.intern(parts[0]), parts[1]
+                inputs = parts[2:] if len(parts) > 2 else []
+
+                # Assign a unique ID to the node
+                unique_id = node_counter
+                node_counter += 1
+
+                # Store the node details
+                self.nodes[node_id] = {
+                    "unique_id": unique_id,
+                    "type": node_type,
+                    "inputs": inputs,
+                    "outputs": [],
+                }
+
+                if node_type == "INPUT":
+                    self.inputs.append(node_id)
+                elif node_type == "OUTPUT":
+                    self.outputs.append(node_id)
 
             # Populate outputs for each node
             for node_id, details in self.nodes.items():
@@ -62,62 +85,118 @@ class Circuit:
                     if input_id not in self.nodes:
                         raise ValueError(f"Undefined input node: {input_id}")
                     self.nodes[input_id]["outputs"].append(node_id)
+
+            self.build_arrays()
         except FileNotFoundError:
             raise FileNotFoundError(f"File not found: {self.file_path}")
         except ValueError as ve:
             raise ValueError(f"Error reading circuit: {ve}")
 
+    def build_arrays(self):
+        """
+        Encodes the parsed nodes as flat arrays indexed by node position.
+
+        Node types become small integer IDs into `type_names`, and the input and
+        output connections are stored in CSR form: the neighbours of node `i` are
+        `indices[indptr[i]:indptr[i + 1]]`.
+        """
+        self.node_ids = list(self.nodes)
+        self.node_index = {node_id: idx for idx, node_id in enumerate(self.node_ids)}
+
+        type_lookup = {}
+        self.type_names = []
+        self.type_ids = []
+        self.inputs_indptr = [0]
+        self.inputs_indices = []
+        self.outputs_indptr = [0]
+        self.outputs_indices = []
+
+        for details in self.nodes.values():
+            node_type = details["type"]
+            if node_type not in type_lookup:
+                type_lookup[node_type] = len(self.type_names)
+                self.type_names.append(node_type)
+            self.type_ids.append(type_lookup[node_type])
+
+            self.inputs_indices.extend(self.node_index[input_id] for input_id in details["inputs"])
+            self.inputs_indptr.append(len(self.inputs_indices))
+            self.outputs_indices.extend(self.node_index[output_id] for output_id in details["outputs"])
+            self.outputs_indptr.append(len(self.outputs_indices))
+
+        self.output_indices = [self.node_index[node_id] for node_id in self.outputs]
+
     def find_critical_path(self):
         """
         Finds the critical path in the circuit.
 
+        Results are cached per circuit file, so analysing an unchanged file again
+        with the same component delays skips the computation.
+
         Returns:
             tuple: Critical path as a sequence of node IDs, total delay, and components with their delays.
         """
-        delays = {}
-        predecessors = {}
-
-        # Initialize delays for input nodes
-        for node_id in self.inputs:
-            delays[node_id] = 0
+        key = (
+            os.path.abspath(self.file_path),
+            self.file_mtime,
+            tuple(sorted(self.component_delays.items())),
+        )
+        if key not in _analysis_cache:
+            critical_path, total_delay, components_with_delays = self.compute_critical_path()
+            _analysis_cache[key] = (tuple(critical_path), total_delay, tuple(components_with_delays))
 
-        # Topologically sort the nodes
-        sorted_nodes = self.topological_sort()
+        critical_path, total_delay, components_with_delays = _analysis_cache[key]
+        return list(critical_path), total_delay, list(components_with_delays)
 
-        # Calculate delays and predecessors
-        for node_id in sorted_nodes:
-            node = self.nodes[node_id]
-            node_type = node["type"]
-            max_input_delay = 0
-            for input_id in node["inputs"]:
-                max_input_delay = max(max_input_delay, delays[input_id])
+    def compute_critical_path(self):
+        """
+        Computes the critical path in the circuit without consulting the cache.
 
-            component_delay = self.component_delays.get(node_type, self.component_delays["DEFAULT"])
-            delays[node_id] = max_input_delay + component_delay
+        Returns:
+            tuple: Critical path as a sequence of node IDs, total delay, and components with their delays.
+        """
+        order = self.topological_order()
+        if len(order) < len(self.node_ids):
+            raise ValueError("Circuit contains a cycle")
 
-            for input_id in node["inputs"]:
-                if delays[node_id] == delays[input_id] + component_delay:
-                    predecessors[node_id] = input_id
+        delay_table = self.delay_table()
+        type_ids = self.type_ids
+        delays, predecessors = _critical_delays(order, self.inputs_indptr, self.inputs_indices, type_ids, delay_table)
 
         # Find the output node with the maximum delay
-        critical_output = max(self.outputs, key=lambda node_id: delays[node_id])
-        total_delay = delays[critical_output]
+        if not self.output_indices:
+            raise ValueError("Circuit has no output nodes")
+        critical_output = -1
+        total_delay = 0.0
+        for idx in self.output_indices:
+            if critical_output == -1 or delays[idx] > total_delay:
+                critical_output = idx
+                total_delay = delays[idx]
 
         # Reconstruct the critical path
-        critical_path = []
-        current_node = critical_output
-        while current_node in predecessors:
-            critical_path.insert(0, current_node)
-            current_node = predecessors[current_node]
-        critical_path.insert(0, current_node)
-
-        components_with_delays = [
-            (node_id, self.component_delays.get(self.nodes[node_id]["type"], self.component_delays["DEFAULT"]))
-            for node_id in critical_path
-        ]
+        path_indices = []
+        current = critical_output
+        while predecessors[current] != -1:
+            path_indices.append(current)
+            current = predecessors[current]
+        path_indices.append(current)
+        path_indices.reverse()
+
+        node_ids = self.node_ids
+        critical_path = [node_ids[idx] for idx in path_indices]
+        components_with_delays = [(node_ids[idx], delay_table[type_ids[idx]]) for idx in path_indices]
 
         return critical_path, total_delay, components_with_delays
 
+    def delay_table(self):
+        """
+        Resolves the component delay of each node type.
+
+        Returns:
+            tuple: Component delays indexed by type ID (see `type_names`).
+        """
+        default_delay = self.component_delays["DEFAULT"]
+        return tuple(self.component_delays.get(node_type, default_delay) for node_type in self.type_names)
+
     def topological_sort(self):
         """
         Performs a topological sort of the circuit nodes.
@@ -125,21 +204,80 @@ class Circuit:
         Returns:
             list: A list of node IDs in topological order.
         """
-        in_degree = {node_id: 0 for node_id in self.nodes}
-        for node_id, details in self.nodes.items():
-            for input_id in details["inputs"]:
-                in_degree[node_id] += 1
+        return [self.node_ids[idx] for idx in self.topological_order()]
+
+    def topological_order(self):
+        """
+        Performs a topological sort over the node indices.
+
+        Returns:
+            list: A list of node indices in topological order.
+        """
+        return _topological_order(self.inputs_indptr, self.outputs_indptr, self.outputs_indices)
+
+
+def _topological_order(in_indptr, out_indptr, out_indices):
+    """
+    Kahn's algorithm over CSR adjacency arrays.
+
+    Args:
+        in_indptr (list): CSR row pointers of the node inputs.
+        out_indptr (list): CSR row pointers of the node outputs.
+        out_indices (list): CSR node indices of the node outputs.
+
+    Returns:
+        list: Node indices in topological order.
+    """
+    n = len(in_indptr) - 1
+    # The in-degree of a node is the length of its CSR input row
+    in_degree = [end - start for start, end in zip(in_indptr, in_indptr[1:])]
+
+    queue = deque(i for i in range(n) if in_degree[i] == 0)
+    sorted_indices = []
+
+    while queue:
+        current = queue.popleft()
+        sorted_indices.append(current)
+
+        for j in range(out_indptr[current], out_indptr[current + 1]):
+            neighbor = out_indices[j]
+            in_degree[neighbor] -= 1
+            if in_degree[neighbor] == 0:
+                queue.append(neighbor)
+
+    return sorted_indices
+
+
+def _critical_delays(order, in_indptr, in_indices, type_ids, delay_table):
+    """
+    Computes the arrival delay and critical predecessor of every node.
+
+    Args:
+        order (list): Node indices in topological order.
+        in_indptr (list): CSR row pointers of the node inputs.
+        in_indices (list): CSR node indices of the node inputs.
+        type_ids (list): Type index of each node.
+        delay_table (tuple): Component delay of each type index.
 
-        queue = [node for node in in_degree if in_degree[node] == 0]
-        sorted_nodes = []
+    Returns:
+        tuple: Arrival delay of each node, and the index of its critical predecessor (-1 if none).
+    """
+    n = len(in_indptr) - 1
+    delays = [0.0] * n
+    predecessors = [-1] * n
 
-        while queue:
-            current = queue.pop(0)
-            sorted_nodes.append(current)
+    for i in order:
+        # Track the slowest input directly; on ties the last one wins
+        best = -1
+        max_input_delay = 0.0
+        for j in range(in_indptr[i], in_indptr[i + 1]):
+            input_idx = in_indices[j]
+            input_delay = delays[input_idx]
+            if best == -1 or input_delay >= max_input_delay:
+                best = input_idx
+                max_input_delay = input_delay
 
-            for neighbor in self.nodes[current]["outputs"]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    queue.append(neighbor)
+        delays[i] = max_input_delay + delay_table[type_ids[i]]
+        predecessors[i] = best
 
-        return sorted_nodes
+    return delays, predecessors
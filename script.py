@@ -1,23 +1,48 @@
+from concurrent.futures import ProcessPoolExecutor
+
 from circuit_class import Circuit
 from visualization_class import CircuitVisualizer
 
 
+def process_circuit(circuit_name):
+    """
+    Analyzes and visualizes a single circuit.
+
+    Args:
+        circuit_name (str): Name of the circuit file (without extension).
+
+    Returns:
+        str: The report for the circuit, printed by the parent process so that
+        output from concurrent workers does not interleave.
+    """
+    circuit = Circuit(f"{circuit_name}.txt")
+    lines = [CircuitVisualizer.visualize_circuit(circuit, output_file=circuit_name)]
+    critical_path, total_delay, components_with_delays = circuit.find_critical_path()
+
+    lines += [
+        f"Circuit: {circuit_name}",
+        f"Critical Path: {' -> '.join(critical_path)}",
+        f"Total Delay: {total_delay:.2f} time units",
+        "Components in Critical Path with Delays:",
+    ]
+    for component, delay in components_with_delays:
+        lines.append(f"  {component}: {delay:.2f} time units")
+
+    lines.append(
+        CircuitVisualizer.visualize_with_critical_path(
+            circuit, critical_path, output_file=f"{circuit_name}_critical_path"
+        )
+    )
+    return "\n".join(lines)
+
+
 def main():
     try:
         circuits = ["circuit1", "circuit2", "circuit3"]
-        for circuit_name in circuits:
-            circuit = Circuit(f"{circuit_name}.txt")
-            CircuitVisualizer.visualize_circuit(circuit, output_file=circuit_name)
-            critical_path, total_delay, components_with_delays = circuit.find_critical_path()
-
-            print(f"Circuit: {circuit_name}")
-            print(f"Critical Path: {' -> '.join(critical_path)}")
-            print(f"Total Delay: {total_delay:.2f} time units")
-            print("Components in Critical Path with Delays:")
-            for component, delay in components_with_delays:
-                print(f"  {component}: {delay:.2f} time units")
-
-            CircuitVisualizer.visualize_with_critical_path(circuit, critical_path, output_file=f"{circuit_name}_critical_path")
+        # Each circuit renders to its own files, so the Graphviz runs can overlap
+        with ProcessPoolExecutor(max_workers=len(circuits)) as executor:
+            for report in executor.map(process_circuit, circuits):
+                print(report)
     except Exception as e:
         print(f"An error occurred: {e}")
 
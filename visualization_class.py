@@ -1,4 +1,46 @@
-from graphviz import Digraph
+import hashlib
+import os
+import shutil
+
+from graphviz import Source
+
+
+def _quote(value):
+    """
+    Quotes a string for use as a DOT attribute value.
+    """
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+def _render(lines, output_file):
+    """
+    Closes a DOT graph body and renders it to a PNG in the outputs directory.
+
+    Renders are cached by a hash of the DOT source as `<output_file>.<hash>.png`,
+    so Graphviz only runs when the graph has changed.
+
+    Args:
+        lines (list): DOT statements, starting with the graph header.
+        output_file (str): The name of the output file (without extension).
+    """
+    lines.append("}")
+    source = "\n".join(lines) + "\n"
+    key = hashlib.blake2b(source.encode("utf-8")).hexdigest()[:16]
+
+    cached_file = f"./outputs/{output_file}.{key}.png"
+    if not os.path.exists(cached_file):
+        # Render under a temporary name so an interrupted run never leaves a
+        # truncated image behind at the cached path
+        temp_file = f"./outputs/{output_file}.{key}.{os.getpid()}.tmp"
+        try:
+            Source(source, format="png").render(temp_file, cleanup=True)
+            os.replace(f"{temp_file}.png", cached_file)
+        finally:
+            for leftover in (temp_file, f"{temp_file}.png"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+    shutil.copyfile(cached_file, f"./outputs/{output_file}.png")
+
 
 class CircuitVisualizer:
     @staticmethod
@@ -9,21 +51,27 @@ class CircuitVisualizer:
         Args:
             circuit (Circuit): The Circuit object.
             output_file (str): The name of the output file (without extension).
+
+        Returns:
+            str: A message naming the saved file.
         """
-        graph = Digraph(format="png")
-        graph.attr(rankdir="LR")
+        lines = ["digraph {", "\trankdir=LR"]
+        nodes = circuit.nodes
+        uid = {node_id: f"node_{details['unique_id']}" for node_id, details in nodes.items()}
 
-        for node_id, details in circuit.nodes.items():
-            label = f"{node_id}\\n{details['type']}"
-            shape = "ellipse" if details["type"] in ["INPUT", "OUTPUT"] else "box"
-            graph.node(details["unique_id"], label=label, shape=shape)
+        for node_id, details in nodes.items():
+            node_type = details["type"]
+            label = _quote(f"{node_id}\\n{node_type}")
+            shape = "ellipse" if node_type in ("INPUT", "OUTPUT") else "box"
+            lines.append(f"\t{uid[node_id]} [label={label} shape={shape}]")
 
-        for node_id, details in circuit.nodes.items():
+        for node_id, details in nodes.items():
+            target = uid[node_id]
             for input_id in details["inputs"]:
-                graph.edge(circuit.nodes[input_id]["unique_id"], details["unique_id"])
+                lines.append(f"\t{uid[input_id]} -> {target}")
 
-        graph.render(f"./outputs/{output_file}", cleanup=True)
-        print(f"Circuit visualization saved to {output_file}.png")
+        _render(lines, output_file)
+        return f"Circuit visualization saved to {output_file}.png"
 
     @staticmethod
     def visualize_with_critical_path(circuit, critical_path, output_file="circuit_with_critical_path"):
@@ -34,22 +82,30 @@ class CircuitVisualizer:
             circuit (Circuit): The Circuit object.
             critical_path (list): List of node IDs in the critical path.
             output_file (str): The name of the output file (without extension).
+
+        Returns:
+            str: A message naming the saved file.
         """
-        graph = Digraph(format="png")
-        graph.attr(rankdir="LR")
+        lines = ["digraph {", "\trankdir=LR"]
 
         critical_edges = set((critical_path[i], critical_path[i + 1]) for i in range(len(critical_path) - 1))
+        critical_nodes = set(critical_path)
+
+        nodes = circuit.nodes
+        uid = {node_id: f"node_{details['unique_id']}" for node_id, details in nodes.items()}
 
-        for node_id, details in circuit.nodes.items():
-            label = f"{node_id}\\n{details['type']}"
-            shape = "ellipse" if details["type"] in ["INPUT", "OUTPUT"] else "box"
-            color = "red" if node_id in critical_path else "black"
-            graph.node(details["unique_id"], label=label, shape=shape, color=color)
+        for node_id, details in nodes.items():
+            node_type = details["type"]
+            label = _quote(f"{node_id}\\n{node_type}")
+            shape = "ellipse" if node_type in ("INPUT", "OUTPUT") else "box"
+            color = "red" if node_id in critical_nodes else "black"
+            lines.append(f"\t{uid[node_id]} [label={label} color={color} shape={shape}]")
 
-        for node_id, details in circuit.nodes.items():
+        for node_id, details in nodes.items():
+            target = uid[node_id]
             for input_id in details["inputs"]:
                 edge_color = "red" if (input_id, node_id) in critical_edges else "black"
-                graph.edge(circuit.nodes[input_id]["unique_id"], details["unique_id"], color=edge_color)
+                lines.append(f"\t{uid[input_id]} -> {target} [color={edge_color}]")
 
-        graph.render(f"./outputs/{output_file}", cleanup=True)
-        print(f"Circuit visualization with critical path saved to {output_file}.png")
+        _render(lines, output_file)
+        return f"Circuit visualization with critical path saved to {output_file}.png"